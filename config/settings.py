@@ -126,6 +126,11 @@ CRAWL_INTERVAL = int(os.getenv("CRAWL_INTERVAL", 4))  # 小时
 # 图表配置
 CHART_DAYS = int(os.getenv("CHART_DAYS", 30))  # 图表显示天数
 SAVE_CHART = os.getenv("SAVE_CHART", False )  # 是否保存图表
+CHART_FIGSIZE = (16, 10)  # 图表尺寸(英寸)
+MERGED_IMAGE_MAX_WIDTH = int(os.getenv("MERGED_IMAGE_MAX_WIDTH", 1200))  # 合并图片中单张图表的最大宽度(像素)
+# 图表保存分辨率(DPI)。默认由合并宽度反推：整张图按 MERGED_IMAGE_MAX_WIDTH 渲染，保存时裁掉白边后只会更窄，
+# 合并时无需再缩小重采样；单独调大DPI时，合并阶段仍会把图表缩小到 MERGED_IMAGE_MAX_WIDTH
+CHART_DPI = int(os.getenv("CHART_DPI", MERGED_IMAGE_MAX_WIDTH // CHART_FIGSIZE[0]))
 
 # 存储配置
 SAVE_JSON = os.getenv("SAVE_JSON", True)  # 是否保存json
@@ -268,13 +268,9 @@ def process_kline_data(kline_data: List[List], signal_type: str = None) -> List[
         # 转换时间戳为datetime
         df['Time'] = pd.to_datetime(df['Time'].astype(int), unit='s')
         
-        # 用0填充NaN和None
-        df = df.fillna(0)
-        
-        # 确保数值类型正确
+        # 确保数值类型正确，NaN和None一次性填充为0
         numeric_columns = ['Open', 'Close', 'High', 'Low', 'Volume', 'Amount']
-        for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
         
         # 按时间升序排序
         df = df.sort_values('Time')
@@ -323,18 +319,10 @@ def process_kline_data(kline_data: List[List], signal_type: str = None) -> List[
         # 添加新数据点
         df = pd.concat([df, pd.DataFrame([new_point])], ignore_index=True)
         
-        # 转换回列表格式
-        processed_data = []
-        for _, row in df.iterrows():
-            processed_data.append([
-                int(row['Time'].timestamp()),
-                float(row['Open']),
-                float(row['Close']),
-                float(row['High']),
-                float(row['Low']),
-                float(row['Volume']),
-                float(row['Amount'])
-            ])
+        # 转换回列表格式（整列转换，避免 iterrows 逐行构造Series）
+        timestamps = ((df['Time'] - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).tolist()
+        values = df[numeric_columns].to_numpy(dtype=np.float64).tolist()
+        processed_data = [[ts] + row for ts, row in zip(timestamps, values)]
         
         return processed_data
         
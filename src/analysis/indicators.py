@@ -9,8 +9,9 @@ import logging
 from enum import Enum
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta  # 导入pandas-ta库
+from numpy.lib.stride_tricks import sliding_window_view
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,56 @@ class IndicatorType(Enum):
     CS_MA = "CsMa"
     ALL = "all"
 
+def _rolling_sma(series: pd.Series, window: int, min_periods: int = None) -> pd.Series:
+    """
+    基于累加和差分的简单移动平均，一次累加即可得到任意窗口的均值。
+
+    Args:
+        series: 输入序列。
+        window: 窗口大小。
+        min_periods: 最少需要的数据点数，默认等于窗口大小 (与 pandas rolling 一致)。
+
+    Returns:
+        pd.Series: 移动平均序列。
+    """
+    values = series.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        # 累加和会被NaN污染，交给pandas按窗口处理
+        return series.rolling(window=window, min_periods=min_periods).mean()
+
+    min_periods = window if min_periods is None else min_periods
+    size = values.shape[0]
+    cumsum = np.empty(size + 1)
+    cumsum[0] = 0.0
+    np.cumsum(values, out=cumsum[1:])
+
+    out = np.full(size, np.nan)
+    if size >= window:
+        out[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    # 窗口未填满的前段，按已有数据点数求均值
+    head = np.arange(max(min_periods, 1), min(window, size + 1))
+    out[head - 1] = cumsum[head] / head
+    return pd.Series(out, index=series.index)
+
+
+def _rma(series: pd.Series, length: int) -> pd.Series:
+    """Wilder平滑移动平均 (与 pandas-ta 的 rma 一致)"""
+    return series.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+
+def _ema(series: pd.Series, length: int) -> pd.Series:
+    """
+    指数移动平均 (与 pandas-ta 的默认 ema 一致)：
+    以前 length 个值的SMA作为种子，之前的值置为NaN，再做 adjust=False 的递推。
+    """
+    values = series.to_numpy(dtype=np.float64, copy=True)
+    if values.shape[0] < length:
+        return pd.Series(np.nan, index=series.index)
+    values[length - 1] = values[:length].mean()
+    values[:length - 1] = np.nan
+    return pd.Series(values, index=series.index).ewm(span=length, adjust=False).mean()
+
+
 class TechnicalIndicators:
     """技术指标类"""
     
@@ -57,8 +108,17 @@ class TechnicalIndicators:
     def calculate_bollinger_bands(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """计算布林带指标"""
         try:
-            middle = df['Close'].rolling(window=self.boll_period).mean()
-            std = df['Close'].rolling(window=self.boll_period).std()
+            close = df['Close'].to_numpy(dtype=np.float64)
+            n = self.boll_period
+            middle_arr = np.full(close.shape[0], np.nan)
+            std_arr = np.full(close.shape[0], np.nan)
+            if n > 0 and close.shape[0] >= n:
+                # 在同一组滑动窗口视图上一次性计算均值和样本标准差 (ddof=1，与pandas rolling一致)
+                windows = sliding_window_view(close, n)
+                middle_arr[n - 1:] = windows.mean(axis=1)
+                std_arr[n - 1:] = windows.std(axis=1, ddof=1)
+            middle = pd.Series(middle_arr, index=df.index)
+            std = pd.Series(std_arr, index=df.index)
             upper = middle + (std * self.boll_std)
             lower = middle - (std * self.boll_std)
             return middle, upper, lower
@@ -69,9 +129,12 @@ class TechnicalIndicators:
     def calculate_vegas_tunnel(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """计算维加斯通道指标"""
         try:
-            ema1 = df['Close'].ewm(span=self.vegas_ema1, adjust=False).mean()
-            ema2 = df['Close'].ewm(span=self.vegas_ema2, adjust=False).mean()
-            ema3 = df['Close'].ewm(span=self.vegas_ema3, adjust=False).mean()
+            # 只取一次Close列，三条EMA仍使用pandas的ewm计算；结果不缓存，每次调用都重新计算
+            close = df['Close']
+            ema1, ema2, ema3 = (
+                close.ewm(span=span, adjust=False).mean()
+                for span in (self.vegas_ema1, self.vegas_ema2, self.vegas_ema3)
+            )
             return ema1, ema2, ema3
         except Exception as e:
             logger.error(f"计算维加斯通道时出错: {e}")
@@ -80,9 +143,10 @@ class TechnicalIndicators:
     def calculate_volume_ma(self, df: pd.DataFrame) -> List[pd.Series]:
         """计算成交量的移动平均线"""
         try:
-            ma1 = df['Volume'].rolling(window=self.volume_ma1, min_periods=1).mean()
-            ma2 = df['Volume'].rolling(window=self.volume_ma2, min_periods=1).mean()
-            ma3 = df['Volume'].rolling(window=self.volume_ma3, min_periods=1).mean()
+            volume = df['Volume']
+            ma1 = _rolling_sma(volume, self.volume_ma1, min_periods=1)
+            ma2 = _rolling_sma(volume, self.volume_ma2, min_periods=1)
+            ma3 = _rolling_sma(volume, self.volume_ma3, min_periods=1)
             return [ma1, ma2, ma3]
         except Exception as e:
             logger.error(f"计算成交量MA时出错: {e}")
@@ -100,7 +164,11 @@ class TechnicalIndicators:
             pd.Series: RSI指标序列。
         """
         try:
-            rsi = df.ta.rsi(length=self.rsi_period)
+            # 直接用pandas计算，结果与 pandas-ta 的 rsi 一致，省去其访问器的参数校验和结果封装开销
+            diff = df['Close'].diff()
+            positive_avg = _rma(diff.clip(lower=0), self.rsi_period)
+            negative_avg = _rma(diff.clip(upper=0), self.rsi_period)
+            rsi = 100 * positive_avg / (positive_avg + negative_avg.abs())
             return rsi
         except Exception as e:
             logger.error(f"计算RSI时出错: {e}")
@@ -117,11 +185,16 @@ class TechnicalIndicators:
             Tuple[pd.Series, pd.Series, pd.Series]: (MACD线, 信号线, 柱状图)。
         """
         try:
-            macd_df = df.ta.macd(fast=self.macd_fast, slow=self.macd_slow, signal=self.macd_signal)
-            # pandas-ta返回的列名格式为 'MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9'
-            macd_line = macd_df[f'MACD_{self.macd_fast}_{self.macd_slow}_{self.macd_signal}']
-            histogram = macd_df[f'MACDh_{self.macd_fast}_{self.macd_slow}_{self.macd_signal}']
-            signal_line = macd_df[f'MACDs_{self.macd_fast}_{self.macd_slow}_{self.macd_signal}']
+            # 直接用pandas计算，结果与 pandas-ta 的 macd 一致
+            close = df['Close']
+            macd_line = _ema(close, self.macd_fast) - _ema(close, self.macd_slow)
+            # 信号线从MACD线第一个有效值开始计算
+            first_valid = macd_line.first_valid_index()
+            if first_valid is None:
+                signal_line = pd.Series(np.nan, index=df.index)
+            else:
+                signal_line = _ema(macd_line.loc[first_valid:], self.macd_signal).reindex(df.index)
+            histogram = macd_line - signal_line
             return macd_line, signal_line, histogram
         except Exception as e:
             logger.error(f"计算MACD时出错: {e}")
@@ -138,9 +211,10 @@ class TechnicalIndicators:
             Tuple[pd.Series, pd.Series, pd.Series]: (MA快线, MA中线, MA慢线)。
         """
         try:
-            ma_fast = df['Close'].rolling(window=self.cs_ma_fast).mean()
-            ma_medium = df['Close'].rolling(window=self.cs_ma_medium).mean()
-            ma_slow = df['Close'].rolling(window=self.cs_ma_slow).mean()
+            close = df['Close']
+            ma_fast = _rolling_sma(close, self.cs_ma_fast)
+            ma_medium = _rolling_sma(close, self.cs_ma_medium)
+            ma_slow = _rolling_sma(close, self.cs_ma_slow)
             return ma_fast, ma_medium, ma_slow
         except Exception as e:
             logger.error(f"计算CS MA时出错: {e}")
@@ -5,27 +5,194 @@
 信号汇总模块，用于收集和保存交易信号
 """
 
+import io
 import os
+import time
+import bisect
 import logging
-import json
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-import pandas as pd
+from operator import itemgetter
+from typing import Dict, List, Optional, Union
 from config import settings
 from src.notification.ntfy import send as send_ntfy
+from src.utils.formatter import clean_item_name
 
 logger = logging.getLogger(__name__)
 
+_MARKDOWN_HEADER = (
+    "| 商品ID | 商品名称 | 信号类型 | 触发价格 | 开盘价 | 收盘价 | 成交量 | 布林中轨 | 布林上轨 | 布林下轨 | 3天前价格 | 3天涨跌幅 | 7天前价格 | 7天涨跌幅 | 上次触碰价格 | 上次触碰时间 | 间隔天数 | 触发时间 |\n"
+    "|---------|----------|----------|----------|---------|---------|----------|----------|----------|---------|------------|------------|------------|------------|--------------|--------------|----------|----------|\n"
+)
+# ntfy通知中单个信号的格式模板，模块加载时创建一次
+_NTFY_SIGNAL_FMT = (
+    "📌 {}\n"
+    "   ID: {}\n"
+    "   Price: {:.2f}\n"
+    "   Volume: {:d}\n"
+    "   BOLL: {:.2f} | {:.2f} | {:.2f}\n"
+    "   3days ago: {:.2f} ({:+.2f}%)\n"
+    "   7days ago: {:.2f} ({:+.2f}%)\n"
+).format
+_B64 = base64.b64encode  # header编码使用的base64函数，模块加载时绑定
+# 一次取出布林带三个值 (middle, upper, lower)
+_GET_BOLL = itemgetter('middle', 'upper', 'lower')
+_EMPTY_PRICE_CHANGES = {
+    'day3': {'price': 0.0, 'diff': 0.0, 'rate': 0.0},
+    'day7': {'price': 0.0, 'diff': 0.0, 'rate': 0.0}
+}
+
+
+def _day7_rate_desc(signal: Dict) -> float:
+    """信号排序键：按7天价格变化率降序"""
+    return -signal['price_changes']['day7']['rate']
+
+
+def _fmt_ma(values: list, rounded: bool = False) -> str:
+    """
+    将成交量均线值格式化为 "ma5/ma10/ma20" 形式
+
+    Args:
+        values: 均线值列表，通常为 MA5/MA10/MA20 三个值
+        rounded: 是否先四舍五入为整数
+
+    Returns:
+        以 '/' 连接的字符串
+    """
+    if len(values) == 3:
+        # 常见的三条均线直接按下标格式化
+        if rounded:
+            return f"{round(values[0])}/{round(values[1])}/{round(values[2])}"
+        return f"{values[0]}/{values[1]}/{values[2]}"
+    if rounded:
+        values = map(round, values)
+    return '/'.join(map(str, values))
+
+
+def _format_markdown_row(signal: Dict) -> str:
+    """
+    将单个信号格式化为markdown表格的一行
+
+    Args:
+        signal: 信号字典
+
+    Returns:
+        markdown表格行（包含换行符）
+    """
+    # 获取历史触碰点信息，确保previous_touch存在
+    prev_touch = signal.get('previous_touch') or {}
+    price_changes = signal.get('price_changes') or _EMPTY_PRICE_CHANGES
+
+    # 安全地获取价格并格式化
+    try:
+        prev_price = f"{prev_touch.get('price', 0):.2f}" if prev_touch.get('price') is not None else '-'
+    except (TypeError, ValueError):
+        prev_price = '-'
+
+    # 安全地获取其他信息
+    prev_time = prev_touch.get('timestamp', '-')
+    days_ago = str(prev_touch.get('days_ago', '-'))
+    boll_middle, boll_upper, boll_lower = _GET_BOLL(signal['boll_values'])
+
+    return (
+        f"| {signal['item_id']} | "
+        f"{signal['name']} | "
+        f"{signal['signal_type']} | "
+        f"{signal['price']:.2f} | "
+        f"{signal['open_price']:.2f} | "
+        f"{signal['close_price']:.2f} | "
+        f"{signal['volume']:.2f} | "
+        f"{boll_middle:.2f} | "
+        f"{boll_upper:.2f} | "
+        f"{boll_lower:.2f} | "
+        f"{price_changes['day3']['price']:.2f} | "
+        f"{price_changes['day3']['rate']:+.2f}% | "
+        f"{price_changes['day7']['price']:.2f} | "
+        f"{price_changes['day7']['rate']:+.2f}% | "
+        f"{prev_price} | "
+        f"{prev_time} | "
+        f"{days_ago} | "
+        f"{signal['timestamp']} |\n"
+    )
+
+
+def _format_ntfy_signal(item_id: str, signal: Dict) -> str:
+    """
+    将单个信号格式化为ntfy消息中的一段文本
+
+    Args:
+        item_id: 商品ID
+        signal: 信号字典
+
+    Returns:
+        格式化后的信号文本
+    """
+    # 一次性取出嵌套字典，避免重复索引
+    boll_middle, boll_upper, boll_lower = _GET_BOLL(signal['boll_values'])
+    price_changes = signal.get('price_changes') or _EMPTY_PRICE_CHANGES
+    day3 = price_changes['day3']
+    day7 = price_changes['day7']
+    return _NTFY_SIGNAL_FMT(
+        signal['clean_name'], item_id, signal['price'], int(signal['volume']),
+        boll_middle, boll_upper, boll_lower,
+        day3['price'], day3['rate'],
+        day7['price'], day7['rate'],
+    )
+
+
+
+def _format_report_signal(signal: Dict) -> str:
+    """
+    将单个买入/卖出信号格式化为报告中的文本块
+
+    Args:
+        signal: 信号字典
+
+    Returns:
+        信号文本块
+    """
+    if signal['signal_type'] == 'buy':
+        volume = int(signal['volume'])
+        volume_ma = _fmt_ma(signal['volume_ma'])
+    else:
+        volume = round(signal['volume'])
+        volume_ma = _fmt_ma(signal['volume_ma'], rounded=True)
+    boll_middle, boll_upper, boll_lower = _GET_BOLL(signal['boll_values'])
+    day3 = signal['price_changes']['day3']
+    day7 = signal['price_changes']['day7']
+
+    signal_info = [
+        f"📌 {signal['clean_name']}",
+        f"   ID: {signal['item_id']}",
+        f"   Price: ¥{signal['price']:.2f}",
+        f"   Volume: {volume}",
+        f"   Volume MA(5/10/20): {volume_ma}",
+        f"   BOLL: ¥{boll_middle:.2f} | ¥{boll_upper:.2f} | ¥{boll_lower:.2f}",
+        f"   3days ago: ¥{day3['price']:.2f} ({day3['rate']:+.2f}%)",
+        f"   7days ago: ¥{day7['price']:.2f} ({day7['rate']:+.2f}%)",
+    ]
+
+    # 添加历史触碰点信息
+    if signal.get('previous_touch'):
+        prev = signal['previous_touch']
+        # 与markdown行一致，价格缺失时显示为 '-'
+        prev_price = f"¥{prev['price']:.2f}" if prev.get('price') is not None else '-'
+        signal_info.append(f"   Previous Touch: {prev_price} ({prev.get('days_ago', '-')} days ago)")
+
+    return "\n".join(signal_info)
+
 class SignalSummary:
     """信号汇总类"""
     
     def __init__(self):
         """初始化信号汇总"""
         self.signals_dir = os.path.join(settings.DATA_DIR, "signals")
-        if not os.path.exists(self.signals_dir):
-            os.makedirs(self.signals_dir)
+        os.makedirs(self.signals_dir, exist_ok=True)
         self.signals: Dict[str, list] = {}  # 存储信号数据
+        self._by_type: Dict[str, Dict[str, list]] = {}  # 按收藏夹和信号类型分组的信号，添加时即完成分组
+        self._ts_second = None  # _current_ts 缓存对应的秒数
+        self._ts_cached = ''  # 当前秒的时间字符串
     
     def add_signal(self, item_id: str, item_name: str, signal_type: str, 
                   price: float, open_price: float, close_price: float,
@@ -62,13 +229,11 @@ class SignalSummary:
                 }
         """
         if timestamp is None:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            timestamp = self._current_ts()
             
-        if not self.signals.get(fav_name):
-            self.signals[fav_name] = []
-        
-        self.signals[fav_name].append({
+        signal = {
             'name': item_name,
+            'clean_name': clean_item_name(item_name),  # 清理后的名称只计算一次，供各个输出复用
             'signal_type': signal_type,
             'price': price,
             'open_price': open_price,
@@ -84,7 +249,26 @@ class SignalSummary:
             'item_id': item_id,
             'volume_ma': volume_ma,
             'large_order_timeline': large_order_timeline
-        })
+        }
+        # 信号加入后不再变化，输出用的行文本在此预先生成，报告阶段只需拼接
+        # 所有行文本都在修改任何容器之前生成，格式化失败时不会留下只加入了一半的信号
+        try:
+            signal['md_row'] = _format_markdown_row(signal)
+            signal['ntfy_row'] = _format_ntfy_signal(item_id, signal)
+            if signal_type in ('buy', 'sell'):
+                signal['report_row'] = _format_report_signal(signal)
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            # 字段不完整或数值非法(如成交量为NaN)时记录日志并跳过该信号，不影响其他信号
+            logger.error(f"信号格式化失败，已跳过: 商品={item_name}({item_id}), 类型={signal_type}, 错误: {e}")
+            return
+
+        self.signals.setdefault(fav_name, []).append(signal)
+        same_type = self._by_type.setdefault(fav_name, {}).setdefault(signal_type, [])
+        if signal_type in ('buy', 'sell'):
+            # 买卖信号按7天涨跌幅降序插入，输出时无需再排序（相同涨跌幅保持添加顺序）
+            bisect.insort(same_type, signal, key=_day7_rate_desc)
+        else:
+            same_type.append(signal)
         
         logger.info(f"添加{signal_type}信号: 商品={item_name}({item_id}), 价格={price:.2f}, 时间={timestamp}")
         # if previous_touch:
@@ -93,26 +277,21 @@ class SignalSummary:
         #     logger.info(f"价格变化: 3天前={price_changes['day3']['price']:.2f} ({price_changes['day3']['rate']:+.2f}%), "
         #                f"7天前={price_changes['day7']['price']:.2f} ({price_changes['day7']['rate']:+.2f}%)")
     
-    @staticmethod
-    def _clean_item_name(name: str) -> str:
+    def _current_ts(self) -> str:
         """
-        清理商品名称中的特殊字符
+        获取当前时间字符串（精确到秒）
+        
+        同一秒内批量添加信号时复用已格式化的结果
         
-        Args:
-            name: 原始商品名称
-            
         Returns:
-            清理后的商品名称
+            格式为 'YYYY-mm-dd HH:MM:SS' 的时间字符串
         """
-        # 移除可能影响markdown表格格式的字符
-        special_chars = ['|', '*', '`', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!']
-        cleaned_name = name
-        for char in special_chars:
-            cleaned_name = cleaned_name.replace(char, ' ')
-        # 移除多余的空格
-        cleaned_name = ' '.join(cleaned_name.split())
-        return cleaned_name
-
+        second = int(time.time())
+        if second != self._ts_second:
+            self._ts_cached = datetime.fromtimestamp(second).isoformat(sep=' ')
+            self._ts_second = second
+        return self._ts_cached
+    
     def save_to_markdown(self) -> Optional[str]:
         """
         将信号汇总保存为Markdown格式
@@ -134,50 +313,14 @@ class SignalSummary:
             filename = f"signals_{current_time.strftime('%Y%m%d_%H%M%S')}.md"
             filepath = os.path.join(signals_dir, filename)
             
-            with open(filepath, "w", encoding="utf-8") as f:
-                # 写入表头
-                f.write("| 商品ID | 商品名称 | 信号类型 | 触发价格 | 开盘价 | 收盘价 | 成交量 | 布林中轨 | 布林上轨 | 布林下轨 | 3天前价格 | 3天涨跌幅 | 7天前价格 | 7天涨跌幅 | 上次触碰价格 | 上次触碰时间 | 间隔天数 | 触发时间 |\n")
-                f.write("|---------|----------|----------|----------|---------|---------|----------|----------|----------|---------|------------|------------|------------|------------|--------------|--------------|----------|----------|\n")
-                
-                # 写入每个信号
-                for item_id, signal in self.signals.items():
-                    # 获取历史触碰点信息，确保previous_touch存在
-                    prev_touch = signal.get('previous_touch') or {}
-                    price_changes = signal.get('price_changes') or {
-                        'day3': {'price': 0.0, 'diff': 0.0, 'rate': 0.0},
-                        'day7': {'price': 0.0, 'diff': 0.0, 'rate': 0.0}
-                    }
-                    
-                    # 安全地获取价格并格式化
-                    try:
-                        prev_price = f"{prev_touch.get('price', 0):.2f}" if prev_touch.get('price') is not None else '-'
-                    except (TypeError, ValueError):
-                        prev_price = '-'
-                    
-                    # 安全地获取其他信息
-                    prev_time = prev_touch.get('timestamp', '-')
-                    days_ago = str(prev_touch.get('days_ago', '-'))
-                    
-                    f.write(
-                        f"| {item_id} | "
-                        f"{signal['name']} | "
-                        f"{signal['signal_type']} | "
-                        f"{signal['price']:.2f} | "
-                        f"{signal['open_price']:.2f} | "
-                        f"{signal['close_price']:.2f} | "
-                        f"{signal['volume']:.2f} | "
-                        f"{signal['boll_values']['middle']:.2f} | "
-                        f"{signal['boll_values']['upper']:.2f} | "
-                        f"{signal['boll_values']['lower']:.2f} | "
-                        f"{price_changes['day3']['price']:.2f} | "
-                        f"{price_changes['day3']['rate']:+.2f}% | "
-                        f"{price_changes['day7']['price']:.2f} | "
-                        f"{price_changes['day7']['rate']:+.2f}% | "
-                        f"{prev_price} | "
-                        f"{prev_time} | "
-                        f"{days_ago} | "
-                        f"{signal['timestamp']} |\n"
-                    )
+            # 所有行一次性拼接后写入
+            body = ''.join(
+                signal['md_row']
+                for fav_signals in self.signals.values()
+                for signal in fav_signals
+            )
+            with open(filepath, "wb") as f:
+                f.write((_MARKDOWN_HEADER + body).encode("utf-8"))
                 
             logger.info(f"信号汇总已保存到: {filepath}")
             return filepath
@@ -189,40 +332,35 @@ class SignalSummary:
     def clear_signals(self):
         """清空信号数据"""
         self.signals.clear() 
+        self._by_type.clear()
+
+    def _signals_of_type(self, fav_name: str, signal_type: str) -> List[dict]:
+        """获取指定收藏夹中某一类型的信号列表（添加信号时已分组）"""
+        return self._by_type.get(fav_name, {}).get(signal_type, [])
         
-    def _sort_signals_by_price_change(self, signals: list[dict], signal_type: str = None) -> List[tuple]:
+    def _signals_by_day7_rate(self, fav_name: str, signal_type: str) -> List[tuple]:
         """
-        按7天价格变化率对信号进行排序
+        获取按7天价格变化率降序排列的信号
+        
+        不在此排序：添加信号时已按7天价格变化率有序插入，这里只按顺序取出
         
         Args:
-            signals: 信号字典
-            signal_type: 可选的信号类型过滤 ('buy' 或 'sell')
+            fav_name: 收藏夹名称
+            signal_type: 信号类型 ('buy' 或 'sell')
             
         Returns:
-            排序后的信号列表，每个元素为 (item_id, signal_dict) 元组
+            信号列表，每个元素为 (item_id, signal_dict) 元组
         """
-        
-        # 过滤信号类型（如果指定）
-        filtered_signals = []
-        for item in signals:
-            if signal_type and item['signal_type'] != signal_type:
-                continue
-            filtered_signals.append((item['item_id'], item))
-        
-        # 按7天价格变化率排序（降幅越大越靠前）
-        return sorted(
-            filtered_signals,
-            key=lambda x: x[1]['price_changes']['day7']['rate'],
-            reverse=True
-        )
+        return [(signal['item_id'], signal) for signal in self._signals_of_type(fav_name, signal_type)]
         
     def _filter_singal_by_type(self, signals: list[dict], signal_type: str = None):
         filtered_singals = []
         
         for item in signals:
-            if item['signal_type'] == signal_type:
-                if item:
-                    filtered_singals.append(item)
+            if signal_type and item['signal_type'] != signal_type:
+                continue
+            if item:
+                filtered_singals.append(item)
                 
         return filtered_singals
         
@@ -267,65 +405,22 @@ class SignalSummary:
             
             message_parts = []
             message_parts.append(f"📊 {title}")
-            message_parts.append(f"🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            message_parts.append(f"🕒 {datetime.now().isoformat(sep=' ', timespec='seconds')}")
             message_parts.append("")
             
-            # 分类并排序信号
-            buy_signals = []
-            sell_signals = []
-            
-            for fav_name, item in self.signals: 
+            for fav_name, item in self.signals.items(): 
+                # 分类并排序信号（每个收藏夹单独统计）
+                buy_signals = []
+                sell_signals = []
                 message_parts.append(f"❤ Fav List {fav_name}")
                 
                 # 获取排序后的买入和卖出信号
-                sorted_buy_signals = self._sort_signals_by_price_change(item, 'buy')
-                sorted_sell_signals = self._sort_signals_by_price_change(item, 'sell')
+                sorted_buy_signals = self._signals_by_day7_rate(fav_name, 'buy')
+                sorted_sell_signals = self._signals_by_day7_rate(fav_name, 'sell')
                 
-                # 处理买入信号
-                for item_id, signal in sorted_buy_signals:
-                    # 清理商品名称
-                    cleaned_name = self._clean_item_name(signal['name'])
-                    
-                    # 获取价格变化信息
-                    price_changes = signal.get('price_changes', {
-                        'day3': {'price': 0.0, 'diff': 0.0, 'rate': 0.0},
-                        'day7': {'price': 0.0, 'diff': 0.0, 'rate': 0.0}
-                    })
-                    
-                    # 构建信号信息
-                    signal_info = (
-                        f"📌 {cleaned_name}\n"
-                        f"   ID: {item_id}\n"
-                        f"   Price: {signal['price']:.2f}\n"
-                        f"   Volume: {int(signal['volume'])}\n"
-                        f"   BOLL: {signal['boll_values']['middle']:.2f} | {signal['boll_values']['upper']:.2f} | {signal['boll_values']['lower']:.2f}\n"
-                        f"   3days ago: {price_changes['day3']['price']:.2f} ({price_changes['day3']['rate']:+.2f}%)\n"
-                        f"   7days ago: {price_changes['day7']['price']:.2f} ({price_changes['day7']['rate']:+.2f}%)\n"
-                    )
-                    buy_signals.append(signal_info)
-                
-                # 处理卖出信号
-                for item_id, signal in sorted_sell_signals:
-                    # 清理商品名称
-                    cleaned_name = self._clean_item_name(signal['name'])
-                    
-                    # 获取价格变化信息
-                    price_changes = signal.get('price_changes', {
-                        'day3': {'price': 0.0, 'diff': 0.0, 'rate': 0.0},
-                        'day7': {'price': 0.0, 'diff': 0.0, 'rate': 0.0}
-                    })
-                    
-                    # 构建信号信息
-                    signal_info = (
-                        f"📌 {cleaned_name}\n"
-                        f"   ID: {item_id}\n"
-                        f"   Price: {signal['price']:.2f}\n"
-                        f"   Volume: {int(signal['volume'])}\n"
-                        f"   BOLL: {signal['boll_values']['middle']:.2f} | {signal['boll_values']['upper']:.2f} | {signal['boll_values']['lower']:.2f}\n"
-                        f"   3days ago: {price_changes['day3']['price']:.2f} ({price_changes['day3']['rate']:+.2f}%)\n"
-                        f"   7days ago: {price_changes['day7']['price']:.2f} ({price_changes['day7']['rate']:+.2f}%)\n"
-                    )
-                    sell_signals.append(signal_info)
+                # 拼接预先生成的买入和卖出信号文本
+                buy_signals.extend(signal['ntfy_row'] for _, signal in sorted_buy_signals)
+                sell_signals.extend(signal['ntfy_row'] for _, signal in sorted_sell_signals)
             
                 # 添加买入信号
                 if buy_signals:
@@ -365,30 +460,40 @@ class SignalSummary:
             return False
             
     @staticmethod
-    def merge_images_vertically(image_paths: List[str]) -> Optional[str]:
+    def merge_images_vertically(image_paths: List[str], in_memory: bool = False) -> Optional[Union[str, io.BytesIO]]:
         """
         将多张图片垂直合并为一张长图
         
         Args:
             image_paths: 图片路径列表
+            in_memory: 为True时合并结果编码到内存缓冲区返回，不写入磁盘
             
         Returns:
-            合并后的图片路径，如果失败则返回None
+            合并后的图片路径（in_memory为True时为已定位到开头的BytesIO），如果失败则返回None
         """
         try:
             from PIL import Image
-            import os
             
             # 确保至少有一张图片
             if not image_paths:
                 return None
                 
-            # 读取所有图片
-            images = []
-            for path in image_paths:
-                if os.path.exists(path):
-                    img = Image.open(path)
-                    images.append(img)
+            # 读取所有图片，宽度超过上限的等比缩小，减小合并图片的编码和上传开销
+            max_size = (settings.MERGED_IMAGE_MAX_WIDTH, 1 << 16)
+            
+            def load_image(path):
+                img = Image.open(path)
+                img.load()  # 在工作线程中完成PNG解码（解码时会释放GIL）
+                img.thumbnail(max_size, Image.LANCZOS)
+                return img
+            
+            existing_paths = [path for path in image_paths if os.path.exists(path)]
+            if len(existing_paths) > 1:
+                # 多张图片并行解码
+                with ThreadPoolExecutor(max_workers=min(8, len(existing_paths))) as executor:
+                    images = list(executor.map(load_image, existing_paths))
+            else:
+                images = [load_image(path) for path in existing_paths]
                     
             if not images:
                 return None
@@ -409,12 +514,17 @@ class SignalSummary:
                 y_offset += img.height
                 img.close()
             
-            # 保存合并后的图片
-            output_path = os.path.join(os.path.dirname(image_paths[0]), 'merged_charts.png')
-            merged_image.save(output_path, 'PNG')
+            # 保存合并后的图片（图片随即上传，使用低压缩等级换取更快的编码）
+            if in_memory:
+                output = io.BytesIO()
+            else:
+                output = os.path.join(os.path.dirname(image_paths[0]), 'merged_charts.png')
+            merged_image.save(output, 'PNG', compress_level=1)
             merged_image.close()
             
-            return output_path
+            if in_memory:
+                output.seek(0)
+            return output
             
         except Exception as e:
             logger.error(f"合并图片时出错: {e}")
@@ -448,17 +558,13 @@ class SignalSummary:
                 logger.warning("没有有效的图表文件")
                 return False
             
-            # 合并所有图片
-            merged_path = self.merge_images_vertically(valid_paths)
-            if not merged_path:
+            # 合并所有图片，结果保存在内存中，无需写入临时文件
+            merged_image = self.merge_images_vertically(valid_paths, in_memory=True)
+            if merged_image is None:
                 logger.error("合并图片失败")
                 return False
             
             try:
-                # 读取合并后的图片
-                with open(merged_path, 'rb') as f:
-                    image_data = f.read()
-                
                 # 设置图片消息头
                 image_headers = {
                     "Title": "K Line Image",
@@ -468,18 +574,13 @@ class SignalSummary:
                 }
                 
                 # 发送合并后的图片
-                send_ntfy(topic_name, image_data, url=settings.NATY_SERVER_URL, headers=image_headers)
+                send_ntfy(topic_name, merged_image, url=settings.NATY_SERVER_URL, headers=image_headers)
                 logger.info("已发送合并后的K线图")
                 
-                # 删除临时的合并图片
-                os.remove(merged_path)
-                
                 return True
                 
             except Exception as e:
                 logger.error(f"发送合并图片时出错: {e}")
-                if os.path.exists(merged_path):
-                    os.remove(merged_path)
                 return False
                 
         except Exception as e:
@@ -497,9 +598,11 @@ class SignalSummary:
         Returns:
             编码后的字符串
         """
-        import base64
+        # 纯ASCII且不含换行等控制字符时可直接作为header值，无需编码
+        if value.isascii() and value.isprintable():
+            return value
         # 将字符串转换为base64编码
-        encoded = base64.b64encode(value.encode('utf-8')).decode('ascii')
+        encoded = _B64(value.encode('utf-8')).decode('ascii')
         return f"=?UTF-8?B?{encoded}?="
         
     def send_report(self, topic_name: str = "cs2market", chart_paths: Dict[str, str] = None) -> bool:
@@ -523,7 +626,9 @@ class SignalSummary:
             
             message_parts = []
             message_parts.append(f"📊 {title}")
-            message_parts.append(f"🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            # 报告时间只取一次，同时用于计算拉货事件距今的天数
+            now = datetime.now()
+            message_parts.append(f"🕒 {now.isoformat(sep=' ', timespec='seconds')}")
             message_parts.append("")
             
             for fav_name, item in self.signals.items(): 
@@ -534,63 +639,17 @@ class SignalSummary:
                 message_parts.append(f"==========={fav_name or 'Unknown'}===========")
                 
                 # 获取排序后的买入和卖出信号
-                sorted_buy_signals = self._sort_signals_by_price_change(item, 'buy')
-                sorted_sell_signals = self._sort_signals_by_price_change(item, 'sell')
-                sorted_large_order_signals = self._sort_signals_by_ma_ratio(item, 'large_order')
+                sorted_buy_signals = self._signals_by_day7_rate(fav_name, 'buy')
+                sorted_sell_signals = self._signals_by_day7_rate(fav_name, 'sell')
+                sorted_large_order_signals = self._sort_signals_by_ma_ratio(self._signals_of_type(fav_name, 'large_order'))
                 
-                # 处理买入信号
-                for item_id, signal in sorted_buy_signals:
-                    # 清理商品名称
-                    cleaned_name = self._clean_item_name(signal['name'])
-                    
-                    # 构建信号信息
-                    signal_info = [
-                        f"📌 {cleaned_name}",
-                        f"   ID: {item_id}",
-                        f"   Price: ¥{signal['price']:.2f}",
-                        f"   Volume: {int(signal['volume'])}",
-                        f"   Volume MA(5/10/20): {'/'.join(map(str, signal['volume_ma']))}",
-                        f"   BOLL: ¥{signal['boll_values']['middle']:.2f} | ¥{signal['boll_values']['upper']:.2f} | ¥{signal['boll_values']['lower']:.2f}",
-                        f"   3days ago: ¥{signal['price_changes']['day3']['price']:.2f} ({signal['price_changes']['day3']['rate']:+.2f}%)",
-                        f"   7days ago: ¥{signal['price_changes']['day7']['price']:.2f} ({signal['price_changes']['day7']['rate']:+.2f}%)",
-                    ]
-                    
-                    # 添加历史触碰点信息
-                    if signal.get('previous_touch'):
-                        prev = signal['previous_touch']
-                        signal_info.append(f"   Previous Touch: ¥{prev['price']:.2f} ({prev['days_ago']} days ago)")
-                    
-                    signal_info = "\n".join(signal_info)
-                    buy_signals.append(signal_info)
-                
-                # 处理卖出信号
-                for item_id, signal in sorted_sell_signals:
-                    # 清理商品名称
-                    cleaned_name = self._clean_item_name(signal['name'])
-                    
-                    # 构建信号信息
-                    signal_info = [
-                        f"📌 {cleaned_name}",
-                        f"   ID: {item_id}",
-                        f"   Price: ¥{signal['price']:.2f}",
-                        f"   Volume: {round(signal['volume'])}",
-                        f"   Volume MA(5/10/20): {'/'.join(map(str, map(round, signal['volume_ma'])))}",
-                        f"   BOLL: ¥{signal['boll_values']['middle']:.2f} | ¥{signal['boll_values']['upper']:.2f} | ¥{signal['boll_values']['lower']:.2f}",
-                        f"   3days ago: ¥{signal['price_changes']['day3']['price']:.2f} ({signal['price_changes']['day3']['rate']:+.2f}%)",
-                        f"   7days ago: ¥{signal['price_changes']['day7']['price']:.2f} ({signal['price_changes']['day7']['rate']:+.2f}%)",
-                    ]
-                    
-                    # 添加历史触碰点信息
-                    if signal.get('previous_touch'):
-                        prev = signal['previous_touch']
-                        signal_info.append(f"   Previous Touch: ¥{prev['price']:.2f} ({prev['days_ago']} days ago)")
-                    
-                    signal_info = "\n".join(signal_info)
-                    sell_signals.append(signal_info)
+                # 处理买入和卖出信号（文本块已在添加信号时生成）
+                buy_signals.extend(signal['report_row'] for _, signal in sorted_buy_signals)
+                sell_signals.extend(signal['report_row'] for _, signal in sorted_sell_signals)
                 
                 # 处理拉货信号
                 for item in sorted_large_order_signals:
-                    cleaned_name = self._clean_item_name(item['name'])
+                    cleaned_name = item['clean_name']
 
                     timeline = item['large_order_timeline']
                     info = timeline['info']
@@ -607,7 +666,7 @@ class SignalSummary:
                         #     f"      Price Change: ¥{data['price_change']['open']}-¥{data['price_change']['close']} | {'+' if data['price_change']['rate'] > 0 else '-'}{data['price_change']['rate']}%",
                         # ]
                         message_content = [
-                            f"{data['timestamp']}({(datetime.now() - datetime.strptime(str(data['timestamp']), '%Y-%m-%d %H:%M:%S')).days} days ago)", 
+                            f"{data['timestamp']}({(now - datetime.strptime(str(data['timestamp']), '%Y-%m-%d %H:%M:%S')).days} days ago)", 
                             f"+{data['ma_ratio']:.2f}%", 
                             f"{data['score']:.2f}", 
                             f"{data['volume']}", 
@@ -631,7 +690,7 @@ class SignalSummary:
                         f"   Timestamp: {item['timestamp']}",
                         f"   Price: ¥{item['price']:.2f}",
                         f"   Volume: {int(item['volume'])}",
-                        f"   Volume MA(5/10/20): {'/'.join(map(str, map(round, item['volume_ma'])))}",
+                        f"   Volume MA(5/10/20): {_fmt_ma(item['volume_ma'], rounded=True)}",
                         f"   5 Days Volume: {'/'.join(map(str, map(round, info['neraly_vol'])))}",
                         f"   5 Days MA5: {'/'.join(map(str, map(round, info['neraly_ma5'])))}",
                         f"   BOLL: ¥{item['boll_values']['middle']:.2f} | ¥{item['boll_values']['upper']:.2f} | ¥{item['boll_values']['lower']:.2f}",
@@ -705,31 +764,34 @@ class SignalSummary:
             
             message_parts = []
             message_parts.append(f"📊 {title}")
-            message_parts.append(f"🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            message_parts.append(f"🕒 {datetime.now().isoformat(sep=' ', timespec='seconds')}")
             message_parts.append("")
             
             # 分类信号
             buy_signals = []
             sell_signals = []
             
-            for item_id, signal in self.signals.items():
-                # 清理商品名称
-                cleaned_name = self._clean_item_name(signal['name'])
-                signal_type = signal['signal_type']
-                
-                # 构建信号信息
-                signal_info = (
-                    f"📌 {cleaned_name}\n"
-                    f"   ID: {item_id}\n"
-                    f"   Price: {signal['price']:.2f}\n"
-                    f"   Volume: {int(signal['volume'])}\n"
-                    f"   BOLL: {signal['boll_values']['middle']:.2f} | {signal['boll_values']['upper']:.2f} | {signal['boll_values']['lower']:.2f}\n"
-                )
-                
-                if signal_type == 'buy':
-                    buy_signals.append(signal_info)
-                else:
-                    sell_signals.append(signal_info)
+            # self.signals 按收藏夹分组，每个收藏夹对应一个信号列表
+            for fav_signals in self.signals.values():
+                for signal in fav_signals:
+                    signal_type = signal['signal_type']
+                    if signal_type not in ('buy', 'sell'):
+                        continue
+                    boll_middle, boll_upper, boll_lower = _GET_BOLL(signal['boll_values'])
+                    
+                    # 构建信号信息
+                    signal_info = (
+                        f"📌 {signal['clean_name']}\n"
+                        f"   ID: {signal['item_id']}\n"
+                        f"   Price: {signal['price']:.2f}\n"
+                        f"   Volume: {int(signal['volume'])}\n"
+                        f"   BOLL: {boll_middle:.2f} | {boll_upper:.2f} | {boll_lower:.2f}\n"
+                    )
+                    
+                    if signal_type == 'buy':
+                        buy_signals.append(signal_info)
+                    else:
+                        sell_signals.append(signal_info)
             
             # 添加买入信号
             if buy_signals:
@@ -746,68 +808,62 @@ class SignalSummary:
             # 组合消息内容
             message = "\n".join(message_parts)
             
-            # 处理图片
-            merged_path = None
-            if chart_paths:
-                # 获取所有有效的图片路径
-                valid_paths = []
-                for item_id, chart_path in chart_paths.items():
-                    if os.path.exists(chart_path):
-                        valid_paths.append(chart_path)
-                    else:
-                        logger.warning(f"图表文件不存在: {chart_path}")
+            # 保存markdown文件与图片合并、发送互不依赖，在后台线程中同时进行
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                md_future = executor.submit(self.save_to_markdown)
                 
-                if valid_paths:
-                    # 合并所有图片
-                    merged_path = self.merge_images_vertically(valid_paths)
-                    if not merged_path:
-                        logger.error("合并图片失败")
-            
-            try:
-                priority = "3"
+                # 处理图片
+                merged_image = None
+                if chart_paths:
+                    # 获取所有有效的图片路径
+                    valid_paths = []
+                    for item_id, chart_path in chart_paths.items():
+                        if os.path.exists(chart_path):
+                            valid_paths.append(chart_path)
+                        else:
+                            logger.warning(f"图表文件不存在: {chart_path}")
                 
-                # 如果有图片，发送图片作为附件
-                if merged_path and os.path.exists(merged_path):
-                    with open(merged_path, 'rb') as f:
-                        image_data = f.read()
-                        
-                    # 设置消息头
-                    headers = {
-                        "Title": title,
-                        "Tags": "CS2",
-                        "Priority": priority,
-                        "Filename": "charts_summary.png",  # 指定文件名
-                        "Content-Type": "image/png",  # 指定内容类型
-                        "Message": self._encode_header_value(message),  # 对消息进行编码
-                    }
+                    if valid_paths:
+                        # 合并所有图片，结果保存在内存中，无需写入临时文件
+                        merged_image = self.merge_images_vertically(valid_paths, in_memory=True)
+                        if merged_image is None:
+                            logger.error("合并图片失败")
+            
+                try:
+                    priority = "3"
+                
+                    # 如果有图片，发送图片作为附件
+                    if merged_image is not None:
+                        # 设置消息头
+                        headers = {
+                            "Title": title,
+                            "Tags": "CS2",
+                            "Priority": priority,
+                            "Filename": "charts_summary.png",  # 指定文件名
+                            "Content-Type": "image/png",  # 指定内容类型
+                            "Message": self._encode_header_value(message),  # 对消息进行编码
+                        }
                     
-                    # 使用PUT请求发送图片数据
-                    response = send_ntfy(topic_name, image_data, url=settings.NATY_SERVER_URL, headers=headers, method="PUT")
-                else:
-                    # 如果没有图片，只发送文本消息
-                    headers = {
-                        "Title": title,
-                        "Tags": "CS2",
-                        "Priority": priority
-                    }
-                    response = send_ntfy(topic_name, message, url=settings.NATY_SERVER_URL, headers=headers)
+                        # 使用PUT请求发送图片数据
+                        response = send_ntfy(topic_name, merged_image, url=settings.NATY_SERVER_URL, headers=headers, method="PUT")
+                    else:
+                        # 如果没有图片，只发送文本消息
+                        headers = {
+                            "Title": title,
+                            "Tags": "CS2",
+                            "Priority": priority
+                        }
+                        response = send_ntfy(topic_name, message, url=settings.NATY_SERVER_URL, headers=headers)
                 
-                # 清理临时文件
-                if merged_path and os.path.exists(merged_path):
-                    os.remove(merged_path)
+                    # 等待markdown文件保存完成
+                    md_future.result()
                 
-                # 同时保存为markdown文件
-                self.save_to_markdown()
+                    logger.info(f"已发送完整报告到主题: {topic_name}")
+                    return True
                 
-                logger.info(f"已发送完整报告到主题: {topic_name}")
-                return True
-                
-            except Exception as e:
-                logger.error(f"发送报告时出错: {e}")
-                # 清理临时文件
-                if merged_path and os.path.exists(merged_path):
-                    os.remove(merged_path)
-                return False
+                except Exception as e:
+                    logger.error(f"发送报告时出错: {e}")
+                    return False
                 
         except Exception as e:
             logger.error(f"生成报告时出错: {e}")
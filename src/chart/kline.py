@@ -8,15 +8,20 @@
 import os
 import sys
 import logging
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # 只输出PNG文件，使用非交互式后端，必须在导入pyplot/mplfinance之前设置
 import mplfinance as mpf
 import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
 
 from config import settings
 from src.utils.file_utils import clean_filename
+from src.utils.kline_utils import kline_to_dataframe
 from src.analysis.indicators import TechnicalIndicators, IndicatorType
 
 # --- 日志和字体配置 ---
@@ -33,43 +38,61 @@ except Exception:
 
 plt.rcParams['font.family'] = [font.get_name() if font else 'sans-serif']
 plt.rcParams['axes.unicode_minus'] = False
+# 路径简化与分块渲染，加快Agg绘制长折线的速度
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
+
+# 图表样式只依赖模块级字体配置，导入时创建一次，所有实例共享
+_CHART_STYLE = mpf.make_mpf_style(
+    base_mpf_style="charles", gridstyle=":", y_on_right=False,
+    marketcolors=mpf.make_marketcolors(
+        up="red", down="green", edge="inherit", wick="inherit",
+        volume={"up": "red", "down": "green"},
+    ),
+    rc={"font.family": plt.rcParams['font.family'], "axes.labelsize": 10,
+        "xtick.labelsize": 8, "ytick.labelsize": 8},
+)
+
+# 策略名关键字 -> 信号绘制的面板编号 (0: 主图, 2: RSI, 3: MACD)，按顺序匹配
+_STRATEGY_PANEL_MAP = {'RSI': 2, 'MACD': 3, 'Bollinger': 0, 'Vegas': 0, 'CsMa': 0}
+_STRATEGY_PANEL_KEYS = tuple((key.lower(), idx) for key, idx in _STRATEGY_PANEL_MAP.items())
+
+
+@lru_cache(maxsize=128)
+def _panel_for_strategy(strategy_name_lower: str) -> int:
+    """根据(小写)策略名查找信号所在面板，策略名数量很少，结果直接缓存"""
+    for key, idx in _STRATEGY_PANEL_KEYS:
+        if key in strategy_name_lower:
+            return idx
+    return 0
+
 
 class KLineChart:
     """
     一个纯粹的K线图绘制器，支持在主图和副图上绘制不同策略的信号。
     """
-    def __init__(self, days_to_show: int = 90, save_dir: Optional[str] = None):
+    def __init__(self, days_to_show: int = 90, save_dir: Optional[str] = None, dpi: Optional[int] = None):
         self.days_to_show = days_to_show
+        self.dpi = dpi or settings.CHART_DPI
         self.charts_dir = save_dir or os.path.join(settings.DATA_DIR, "charts")
-        if not os.path.exists(self.charts_dir):
-            os.makedirs(self.charts_dir)
-        self.chart_style = self._create_chart_style()
+        os.makedirs(self.charts_dir, exist_ok=True)
+        self.chart_style = _CHART_STYLE
         self.indicators_calculator = TechnicalIndicators()
+        # 常量参考线缓存，键为(长度, 数值)
+        self._const_lines: Dict[tuple, np.ndarray] = {}
 
-    def _create_chart_style(self):
-        return mpf.make_mpf_style(
-            base_mpf_style="charles", gridstyle=":", y_on_right=False,
-            marketcolors=mpf.make_marketcolors(
-                up="red", down="green", edge="inherit", wick="inherit",
-                volume={"up": "red", "down": "green"},
-            ),
-            rc={"font.family": plt.rcParams['font.family'], "axes.labelsize": 10,
-                "xtick.labelsize": 8, "ytick.labelsize": 8},
-        )
+    def _const_line(self, length: int, value: float) -> np.ndarray:
+        """获取指定长度的常量参考线 (如RSI的70/30线)，同一长度只创建一次"""
+        key = (length, value)
+        line = self._const_lines.get(key)
+        if line is None:
+            line = np.full(length, value, dtype=np.float32)
+            self._const_lines[key] = line
+        return line
 
     def _prepare_dataframe(self, raw_kline_data: List[list]) -> pd.DataFrame:
-        if not raw_kline_data: return pd.DataFrame()
-        df = pd.DataFrame(
-            raw_kline_data,
-            columns=['Time', 'Open', 'Close', 'High', 'Low', 'Volume', 'Amount']
-        )
-        df['Time'] = pd.to_datetime(df['Time'].astype(int), unit='s')
-        df.set_index('Time', inplace=True)
-        numeric_cols = ['Open', 'Close', 'High', 'Low', 'Volume', 'Amount']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        df.sort_index(inplace=True)
-        return df
+        return kline_to_dataframe(raw_kline_data)
 
     def plot_candlestick(
         self,
@@ -88,69 +111,79 @@ class KLineChart:
         if df_full.empty: return None
 
         # --- 2. 核心修复：在全量数据上计算所有指标 ---
-        logger.debug(f"在 {len(df_full)} 条完整数据上计算指标...")
+        logger.debug("在 %d 条完整数据上计算指标...", len(df_full))
+        
+        # 均线、布林带等滚动窗口类指标只依赖最近 window-1 根K线，
+        # 在"显示区间 + 最大窗口预热"的尾部数据上计算即可得到与全量计算相同的显示值；
+        # EMA类指标(Vegas/RSI/MACD)依赖全部历史，仍在全量数据上计算
+        calc = self.indicators_calculator
+        warmup = max(calc.boll_period, calc.volume_ma1, calc.volume_ma2, calc.volume_ma3,
+                     calc.cs_ma_fast, calc.cs_ma_medium, calc.cs_ma_slow) - 1
+        df_rolling = df_full.tail(self.days_to_show + warmup)
         
         # 副图指标
-        vol_ma1_full, vol_ma2_full, vol_ma3_full = self.indicators_calculator.calculate_volume_ma(df_full)
-        rsi_full = self.indicators_calculator.calculate_rsi(df_full)
-        macd_line_full, signal_line_full, histogram_full = self.indicators_calculator.calculate_macd(df_full)
+        vol_ma1_full, vol_ma2_full, vol_ma3_full = calc.calculate_volume_ma(df_rolling)
+        rsi_full = calc.calculate_rsi(df_full)
+        macd_line_full, signal_line_full, histogram_full = calc.calculate_macd(df_full)
         
         # --- 3. 截取用于显示的数据 ---
         df = df_full.tail(self.days_to_show)
-        logger.debug(f"截取最近 {len(df)} 天的数据用于显示。")
+        logger.debug("截取最近 %d 天的数据用于显示。", len(df))
 
         # --- 4. 准备 addplots，并从全量指标中截取对应部分 ---
+        n_visible = len(df)
+
+        def _visible(series: pd.Series) -> pd.Series:
+            # 显示区间就是指标序列的最后 n_visible 行，按位置切片，无需按时间标签查找
+            # 转为float32，显示精度足够，传给绘图层的数据量减半
+            return series.iloc[-n_visible:].astype(np.float32)
+
         addplots = []
-        if indicator_type in [IndicatorType.BOLL, IndicatorType.ALL]:
+        # 窗口超过数据长度的均线类指标全为NaN，直接跳过计算和绘制
+        data_len = len(df_full)
+        if indicator_type in [IndicatorType.BOLL, IndicatorType.ALL] and data_len >= calc.boll_period:
             # 主图指标
-            middle_full, upper_full, lower_full = self.indicators_calculator.calculate_bollinger_bands(df_full)
-            addplots.extend([
-                mpf.make_addplot(middle_full[df.index], color='yellow', linestyle='--'),
-                mpf.make_addplot(upper_full[df.index], color='red', linestyle='--'),
-                mpf.make_addplot(lower_full[df.index], color='green', linestyle='--'),
-            ])
+            middle_full, upper_full, lower_full = calc.calculate_bollinger_bands(df_rolling)
+            boll_specs = [(middle_full, 'yellow'), (upper_full, 'red'), (lower_full, 'green')]
+            addplots += [mpf.make_addplot(_visible(s), color=c, linestyle='--') for s, c in boll_specs]
             
         if indicator_type in [IndicatorType.VEGAS, IndicatorType.ALL]:
             # 主图指标
-            vegas_ema1, vegas_ema2, vegas_ema3 = self.indicators_calculator.calculate_vegas_tunnel(df_full)
-            addplots.extend([
-                mpf.make_addplot(vegas_ema1[df.index], color='red', linestyle='-'),
-                mpf.make_addplot(vegas_ema2[df.index], color='blue', linestyle='-'),
-                mpf.make_addplot(vegas_ema3[df.index], color='green', linestyle='-'),
-            ])
+            vegas_ema1, vegas_ema2, vegas_ema3 = calc.calculate_vegas_tunnel(df_full)
+            vegas_specs = [(vegas_ema1, 'red'), (vegas_ema2, 'blue'), (vegas_ema3, 'green')]
+            addplots += [mpf.make_addplot(_visible(s), color=c, linestyle='-') for s, c in vegas_specs]
             
          # (新增) 绘制 CsMa 指标
-        if indicator_type in [IndicatorType.CS_MA, IndicatorType.ALL]: # 您可以创建一个新的IndicatorType.CSMA
-            cs_ma7_full, cs_ma56_full, cs_ma112_full = self.indicators_calculator.calculate_cs_ma(df_full)
-            addplots.extend([
-                mpf.make_addplot(cs_ma7_full[df.index], color='lightblue', width=1),
-                mpf.make_addplot(cs_ma56_full[df.index], color='orange', width=1.5),
-                mpf.make_addplot(cs_ma112_full[df.index], color='purple', width=2),
-            ])
+        if indicator_type in [IndicatorType.CS_MA, IndicatorType.ALL] and data_len >= calc.cs_ma_fast: # 您可以创建一个新的IndicatorType.CSMA
+            cs_ma7_full, cs_ma56_full, cs_ma112_full = calc.calculate_cs_ma(df_rolling)
+            cs_ma_specs = [(cs_ma7_full, calc.cs_ma_fast, 'lightblue', 1),
+                           (cs_ma56_full, calc.cs_ma_medium, 'orange', 1.5),
+                           (cs_ma112_full, calc.cs_ma_slow, 'purple', 2)]
+            addplots += [mpf.make_addplot(_visible(s), color=c, width=w)
+                         for s, window, c, w in cs_ma_specs if data_len >= window]
         
         
         # Panel 1: 成交量MA
-        addplots.extend([
-            mpf.make_addplot(vol_ma1_full[df.index], panel=1, color='blue', alpha=0.7),
-            mpf.make_addplot(vol_ma2_full[df.index], panel=1, color='orange', alpha=0.7),
-            mpf.make_addplot(vol_ma3_full[df.index], panel=1, color='purple', alpha=0.7),
-        ])
+        vol_common = dict(panel=1, alpha=0.7)
+        vol_specs = [(vol_ma1_full, 'blue'), (vol_ma2_full, 'orange'), (vol_ma3_full, 'purple')]
+        addplots += [mpf.make_addplot(_visible(s), color=c, **vol_common) for s, c in vol_specs]
         # Panel 2: RSI
-        addplots.append(mpf.make_addplot(rsi_full[df.index], panel=2, color='orange', ylabel='RSI'))
-        addplots.append(mpf.make_addplot(pd.Series(70, index=df.index), panel=2, color='r', linestyle=':'))
-        addplots.append(mpf.make_addplot(pd.Series(30, index=df.index), panel=2, color='g', linestyle=':'))
+        addplots.append(mpf.make_addplot(_visible(rsi_full), panel=2, color='orange', ylabel='RSI'))
+        addplots.append(mpf.make_addplot(self._const_line(len(df), 70), panel=2, color='r', linestyle=':'))
+        addplots.append(mpf.make_addplot(self._const_line(len(df), 30), panel=2, color='g', linestyle=':'))
         # Panel 3: MACD
-        colors = ['green' if v >= 0 else 'red' for v in histogram_full[df.index]]
-        addplots.append(mpf.make_addplot(histogram_full[df.index], panel=3, type='bar', color=colors, ylabel='MACD'))
-        addplots.append(mpf.make_addplot(macd_line_full[df.index], panel=3, color='blue'))
-        addplots.append(mpf.make_addplot(signal_line_full[df.index], panel=3, color='orange'))
+        histogram = _visible(histogram_full)
+        colors = np.where(histogram.to_numpy() >= 0, 'green', 'red').tolist()
+        addplots.append(mpf.make_addplot(histogram, panel=3, type='bar', color=colors, ylabel='MACD'))
+        addplots.append(mpf.make_addplot(_visible(macd_line_full), panel=3, color='blue'))
+        addplots.append(mpf.make_addplot(_visible(signal_line_full), panel=3, color='orange'))
 
         # --- 5. 绘制图表 ---
         chart_title = f"{item_name} ({len(df)}天)"
         panel_ratios = (6, 2, 2, 2)
         fig, axes = mpf.plot(
             df, type="candle", style=self.chart_style, volume=True,
-            addplot=addplots, returnfig=True, figsize=(16, 10),
+            addplot=addplots, returnfig=True, figsize=settings.CHART_FIGSIZE,
             panel_ratios=panel_ratios, datetime_format="%m/%d", title=f"\n{chart_title}"
         )
 
@@ -163,7 +196,8 @@ class KLineChart:
             safe_title = clean_filename(item_name)
             file_name = f"{safe_title}_{item_id}.png"
             save_path = os.path.join(self.charts_dir, file_name)
-            fig.savefig(save_path, dpi=200, bbox_inches="tight")
+            # 低压缩等级大幅减少PNG编码的CPU开销，文件体积略大
+            fig.savefig(save_path, dpi=self.dpi, bbox_inches="tight", pil_kwargs={"compress_level": 1})
             logger.info(f"K线图已保存至: {save_path}")
             plt.close(fig)
             return save_path
@@ -174,31 +208,34 @@ class KLineChart:
 
     def _plot_signals_on_axes(self, df: pd.DataFrame, signals: List[Dict], axes: List[plt.Axes], indicator_type:IndicatorType = IndicatorType.ALL):
         logger.info(f"开始在图表上智能绘制 {len(signals)} 个信号点...")
-        strategy_panel_map = {'RSI': 2, 'MACD': 3, 'Bollinger': 0, 'Vegas': 0, 'CsMa': 0}
         panel_to_ax_map = {0: axes[0], 1: axes[2], 2: axes[4], 3: axes[6]}
         indicator_map = {IndicatorType.BOLL: "Bollinger", IndicatorType.VEGAS: "Vegas", IndicatorType.CS_MA: "CsMa"}
+        # 循环不变量：提前算好小写形式，避免每个信号重复计算
+        main_indicator = indicator_map.get(indicator_type)
+        main_indicator_lower = main_indicator.lower() if main_indicator else None
 
-        for signal in signals:
-            try:
-                signal_date = pd.to_datetime(signal['timestamp'])
-                if signal_date not in df.index:
-                    continue
+        # 按 (面板, 颜色, 形状) 分组收集坐标，最后每组只调用一次 scatter
+        groups: Dict[tuple, tuple] = {}
+        # 一次性解析所有信号时间，并用二分查找得到在显示区间中的位置 (df.index 已排序)
+        signal_dates = pd.to_datetime([signal.get('timestamp') for signal in signals], errors='coerce')
+        positions = df.index.searchsorted(signal_dates)
+        in_range = positions < len(df)
+        matched = np.zeros(len(signals), dtype=bool)
+        matched[in_range] = df.index[positions[in_range]] == signal_dates[in_range]
 
-                date_idx = df.index.get_loc(signal_date)
+        for signal, date_idx, is_matched in zip(signals, positions.tolist(), matched):
+            if not is_matched:
+                continue
+            try:
                 signal_type = signal['type'].upper()
-                strategy_name = signal['strategy']
+                strategy_name = signal['strategy'].lower()
                 
-                panel_idx = 0
-                for key, idx in strategy_panel_map.items():
-                    if key.lower() in strategy_name.lower():
-                        panel_idx = idx
-                        break
+                panel_idx = _panel_for_strategy(strategy_name)
                 
-                ax = panel_to_ax_map.get(panel_idx)
-                if not ax: continue
+                if panel_to_ax_map.get(panel_idx) is None: continue
                 
                 y_coord = 0
-                if panel_idx == 0 and indicator_map[indicator_type].lower() in strategy_name.lower():
+                if panel_idx == 0 and main_indicator_lower and main_indicator_lower in strategy_name:
                     y_coord = signal['price']
                 elif panel_idx == 2 and 'rsi_value' in signal['details']:
                     y_coord = signal['details']['rsi_value']
@@ -211,9 +248,14 @@ class KLineChart:
                 if y_coord == 0:
                     continue
                 
-                ax.scatter(
-                    date_idx, y_coord, color=marker_color, marker=marker_shape,
-                    s=120, edgecolors='white', zorder=10
-                )
+                xs, ys = groups.setdefault((panel_idx, marker_color, marker_shape), ([], []))
+                xs.append(date_idx)
+                ys.append(y_coord)
             except Exception as e:
-                logger.warning(f"绘制信号点失败: {signal}, 错误: {e}")
\ No newline at end of file
+                logger.warning("绘制信号点失败: %s, 错误: %s", signal, e)
+
+        for (panel_idx, marker_color, marker_shape), (xs, ys) in groups.items():
+            panel_to_ax_map[panel_idx].scatter(
+                xs, ys, color=marker_color, marker=marker_shape,
+                s=120, edgecolors='white', zorder=10
+            )
\ No newline at end of file
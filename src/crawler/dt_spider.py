@@ -8,7 +8,6 @@ SteamDt (steamdt) 平台爬虫实现。
 
 import time
 import logging
-from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
 
 import random
@@ -43,13 +42,9 @@ class SteamDtSpider(SpiderInterface):
         # 数据类别配置
         self.CATEGORY_MONTH = settings.CATEGORY_MONTH
         self.CATEGORY_DAYS = settings.CATEGORY_DAYS
-
-    def _get_base_headers(self) -> Dict[str, str]:
-        """
-        重写基类方法，提供SteamDt平台专用的请求头。
-        """
-        base_headers = super()._get_base_headers()
-        steam_dt_headers = {
+        # SteamDt平台专用的固定请求头，直接设置为会话的默认请求头，后续请求无需再构建
+        # (access-token 在实例化时读取配置，因此不做成模块级常量)
+        self.session.headers.update({
             'Accept': 'application/json',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
             'Content-Type': 'application/json',
@@ -61,17 +56,26 @@ class SteamDtSpider(SpiderInterface):
             'x-device': '1',
             'x-device-id': 'c98ca51c-7431-430a-b198-7c11ca0a74df',
             'language': 'zh_CN',
-        }
-        base_headers.update(steam_dt_headers)
-        return base_headers
+        })
+        # 收藏夹名称缓存，同一次运行中只请求一次
+        self._folder_names: Optional[Dict[str, str]] = None
+
+    def _get_base_headers(self) -> Dict[str, str]:
+        """
+        重写基类方法，提供SteamDt平台专用的请求头。
+        平台固定请求头已设置在会话上，这里只需返回每次随机的User-Agent。
+        """
+        return {'User-Agent': self._get_random_user_agent()}
     
     def _get_favorite_folders_names(self) -> Dict[str, str]:
         """
-        获取收藏夹列表
+        获取收藏夹列表，成功获取后缓存结果，同一实例不再重复请求
         
         Returns:
             Dict[str, str]: 以收藏夹ID为key，收藏夹名称为value的字典
         """
+        if self._folder_names is not None:
+            return self._folder_names
         try:
             logger.info("开始获取收藏夹列表")
             
@@ -97,6 +101,7 @@ class SteamDtSpider(SpiderInterface):
             }
             
             logger.info(f"成功获取到 {len(result)} 个收藏夹信息")
+            self._folder_names = result
             return result
             
         except Exception as e:
@@ -169,18 +174,9 @@ class SteamDtSpider(SpiderInterface):
         Returns:
             时间戳列表，每个时间戳相差90天
         """
-        timestamps = []
-        # 将时间戳转换为datetime对象，便于计算日期
-        current_date = datetime.fromtimestamp(current_timestamp)
-        
-        for i in range(category_month):
-            # 计算90天前的日期
-            past_date = current_date - timedelta(days=category_days * i)
-            # 转换回时间戳（秒）
-            past_timestamp = int(past_date.timestamp())
-            timestamps.append(past_timestamp)
-        
-        return timestamps
+        # 直接按秒做整数运算，每个时间戳向前推 category_days 天
+        step = category_days * 86400
+        return [current_timestamp - step * i for i in range(category_month)]
 
     def _get_item_data(self, item_id: str, max_time: Optional[int] = None) -> Optional[Dict]:
         """
@@ -243,9 +239,9 @@ class SteamDtSpider(SpiderInterface):
             item_data = data['data']
             logger.info(f"获取到 {len(item_data)} 条数据")
             
-            # 检查是否有实际的价格数据
-            valid_data = [d for d in item_data if any(float(x) > 0 for x in d[1:5])]  # 检查OHLC是否都为0
-            if not valid_data:
+            # 检查是否有实际的价格数据（OHLC是否都为0），找到第一个有效值即停止
+            has_valid = any(float(x) > 0 for d in item_data for x in d[1:5])
+            if not has_valid:
                 logger.warning(f"时间戳 {timestamp} 的数据全部为0，可能是无效数据，终止后续请求")
                 break
             
@@ -1,17 +1,23 @@
+from typing import Optional
+
 import requests
 from config import settings
 
+# 模块级持久会话，多次发送（文本报告、图片）复用同一个连接，避免重复握手
+_SESSION = requests.Session()
+
 
-def send(name: str, message: str, url="", headers=None, method="POST"):
+def send(name: str, message: str, url="", headers=None, method="POST", session: Optional[requests.Session] = None):
     """
     发送消息到ntfy服务器
     
     Args:
         name: 主题名称
-        message: 消息内容或二进制数据
+        message: 消息内容、二进制数据或以二进制模式打开的文件对象（流式上传）
         url: 可选的服务器URL
         headers: 可选的HTTP头
         method: HTTP方法，默认为POST，可以是PUT
+        session: 可选的requests会话，默认使用模块级的持久会话
         
     Returns:
         服务器响应的JSON数据
@@ -39,7 +45,7 @@ def send(name: str, message: str, url="", headers=None, method="POST"):
         if 'charset=' not in headers['Content-Type']:
             headers['Content-Type'] = f"{headers['Content-Type']}; charset=utf-8"
 
-    r = requests.request(method, api, data=message, headers=headers)
+    r = (session or _SESSION).request(method, api, data=message, headers=headers)
     print(api, r.text)
 
     return r.json()
@@ -8,6 +8,7 @@
 import logging
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 from .StrategyInterface import StrategyInterface
 from config import settings
@@ -52,7 +53,9 @@ class BollingerStrategy(StrategyInterface):
             logger.warning("数据不足，无法计算布林带。")
             return []
 
-        # 1. 对全量数据一次性计算布林带指标
+        # 1. 对全量数据一次性计算布林带指标 ('newest' 模式只需最后一个窗口的数据)
+        if mode == 'newest':
+            df = df.tail(self.indicators_calculator.boll_period)
         middle, upper, lower = self.indicators_calculator.calculate_bollinger_bands(df)
         if upper.isna().all() or lower.isna().all():
             return []
@@ -79,12 +82,18 @@ class BollingerStrategy(StrategyInterface):
                 signals.append(signal)
 
         elif mode == 'full':
-            # --- 新逻辑：遍历全量数据 ---
-            for i in range(len(df)):
-                # 跳过指标无效的早期数据
-                if pd.isna(upper.iloc[i]) or pd.isna(lower.iloc[i]):
-                    continue
-
+            # --- 新逻辑：向量化扫描全量数据，只对命中的K线构建信号 ---
+            high = df['High'].to_numpy()
+            low = df['Low'].to_numpy()
+            upper_arr = upper.to_numpy()
+            lower_arr = lower.to_numpy()
+
+            # 指标无效（NaN）的早期数据在比较中天然为 False，会被跳过
+            touch_upper = high >= upper_arr * (1 - self.upper_tolerance)
+            touch_lower = low <= lower_arr * (1 + self.lower_tolerance)
+            hits = np.flatnonzero(touch_upper | touch_lower)
+
+            for i in hits:
                 current_data = df.iloc[i]
                 signal_type, details = self._check_signal_condition(
                     current_data, middle.iloc[i], upper.iloc[i], lower.iloc[i]
@@ -144,6 +153,6 @@ class BollingerStrategy(StrategyInterface):
             'strategy': self.strategy_name,
             'type': signal_type,
             'price': price,
-            'timestamp': pd.to_datetime(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
             'details': details
         }
\ No newline at end of file
@@ -8,6 +8,7 @@
 import logging
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 from .StrategyInterface import StrategyInterface
 
@@ -37,7 +38,9 @@ class CsMaStrategy(StrategyInterface):
             logger.warning(f"数据不足 ({len(df)} < {required_len})，无法计算 CsMa。")
             return []
 
-        # 1. 计算指标
+        # 1. 计算指标 ('newest' 模式只需要最后两根K线的均线，截取刚好够用的窗口即可)
+        if mode == 'newest':
+            df = df.tail(required_len + 1)
         ma7, ma56, ma112 = self.indicators_calculator.calculate_cs_ma(df)
         if ma7.isna().all() or ma56.isna().all() or ma112.isna().all():
             return []
@@ -46,18 +49,22 @@ class CsMaStrategy(StrategyInterface):
 
         # 2. 根据模式执行
         if mode == 'newest':
-            # --- 核心修复：使用 .isna().any() 来检查NaN ---
-            if len(df) < 2 or any(s.iloc[-2:].isna().any() for s in [df['Close'], ma7, ma56, ma112]):
+            # 只需要最后两根K线，直接从NumPy数组取值，避免逐个 .iloc 的开销
+            if len(df) < 2:
                 return []
-            
+            lookback = np.array([s.to_numpy()[-2:] for s in (df['Close'], ma7, ma56, ma112)])
+            if np.isnan(lookback).any():
+                return []
+            (prev_close, curr_close), (prev_ma7, curr_ma7), (prev_ma56, curr_ma56), (prev_ma112, curr_ma112) = lookback
+
             signal_type, details = self._check_signal_condition(
-                df['Close'].iloc[-2], df['Close'].iloc[-1],
-                ma7.iloc[-2], ma7.iloc[-1],
-                ma56.iloc[-2], ma56.iloc[-1],
-                ma112.iloc[-2], ma112.iloc[-1]
+                prev_close, curr_close,
+                prev_ma7, curr_ma7,
+                prev_ma56, curr_ma56,
+                prev_ma112, curr_ma112
             )
             if signal_type:
-                signals.append(self._create_signal_dict(df.index[-1], df['Close'].iloc[-1], signal_type, details))
+                signals.append(self._create_signal_dict(df.index[-1], curr_close, signal_type, details))
 
         elif mode == 'full':
             df_merged = pd.DataFrame({
@@ -109,6 +116,6 @@ class CsMaStrategy(StrategyInterface):
             'strategy': self.strategy_name,
             'type': signal_type,
             'price': price,
-            'timestamp': pd.to_datetime(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
             'details': details
         }
\ No newline at end of file
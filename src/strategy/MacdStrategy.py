@@ -8,6 +8,7 @@
 import logging
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 from .StrategyInterface import StrategyInterface
 
@@ -59,15 +60,15 @@ class MacdStrategy(StrategyInterface):
         # 2. 根据模式执行不同逻辑
         if mode == 'newest':
             # --- 原有逻辑：只处理最新点 ---
-            # 确保有至少两个点可以比较
-            valid_macd = macd_line.dropna()
-            valid_signal = signal_line.dropna()
-            if len(valid_macd) < 2 or len(valid_signal) < 2:
+            # 确保有至少两个点可以比较（NaN只出现在序列开头，检查最后两个点即可）
+            macd_arr = macd_line.to_numpy()[-2:]
+            signal_arr = signal_line.to_numpy()[-2:]
+            if len(macd_arr) < 2 or np.isnan(macd_arr).any() or np.isnan(signal_arr).any():
                 return []
             
             signal_type, details = self._check_cross_condition(
-                macd_line.iloc[-2], macd_line.iloc[-1],
-                signal_line.iloc[-2], signal_line.iloc[-1]
+                macd_arr[0], macd_arr[1],
+                signal_arr[0], signal_arr[1]
             )
             
             if signal_type:
@@ -81,11 +82,12 @@ class MacdStrategy(StrategyInterface):
 
         elif mode == 'full':
             # --- 新逻辑：遍历全量数据 ---
-            # 将指标合并到DataFrame中以便对齐和遍历
-            df_merged = df.copy()
-            df_merged['macd'] = macd_line
-            df_merged['signal'] = signal_line
-            df_merged.dropna(inplace=True) # 去掉无法计算指标的早期数据
+            # 只取遍历需要的列组成新的DataFrame，避免复制整个K线数据
+            df_merged = pd.DataFrame({
+                'Close': df['Close'],
+                'macd': macd_line,
+                'signal': signal_line
+            }).dropna() # 去掉无法计算指标的早期数据
 
             # 从第二个有效数据点开始遍历，以便和前一个点比较
             for i in range(1, len(df_merged)):
@@ -141,6 +143,6 @@ class MacdStrategy(StrategyInterface):
             'strategy': self.strategy_name,
             'type': signal_type,
             'price': price,
-            'timestamp': pd.to_datetime(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
             'details': details
         }
\ No newline at end of file
@@ -119,7 +119,7 @@ class RsiStrategy(StrategyInterface):
             'strategy': self.strategy_name,
             'type': signal_type,
             'price': price,
-            'timestamp': pd.to_datetime(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
             'details': {
                 'rsi_value': round(rsi_value, 2),
                 'threshold': self.oversold_threshold if signal_type == 'buy' else self.overbought_threshold
@@ -12,6 +12,7 @@ from typing import List, Dict, Any
 
 import pandas as pd
 from config import settings
+from src.utils.kline_utils import kline_to_dataframe
 from .StrategyInterface import StrategyInterface
 from .RsiStrategy import RsiStrategy
 from .MacdStrategy import MacdStrategy
@@ -45,6 +46,8 @@ class StrategyCenter:
             "Vegas": VegasStrategy,
             "CsMa": CsMaStrategy,
         }
+        # 策略实例缓存：每个策略只实例化一次，在多次 run_strategies 调用间复用
+        self._instances: Dict[str, StrategyInterface] = {}
         
         if type == StrategyType.INVENTORY:
             self.configured_strategies = settings.INVENTORY_STRATEGYS
@@ -59,20 +62,8 @@ class StrategyCenter:
         将原始K线数据列表转换为格式正确的DataFrame。
         (此方法从策略基类移至此处)
         """
-        if not raw_kline_data:
-            return pd.DataFrame()
         try:
-            df = pd.DataFrame(
-                raw_kline_data,
-                columns=['Time', 'Open', 'Close', 'High', 'Low', 'Volume', 'Amount']
-            )
-            df['Time'] = pd.to_datetime(df['Time'].astype(int), unit='s')
-            df.set_index('Time', inplace=True)
-            numeric_cols = ['Open', 'Close', 'High', 'Low', 'Volume', 'Amount']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            df.sort_index(inplace=True)
-            return df
+            return kline_to_dataframe(raw_kline_data)
         except Exception as e:
             logger.error(f"在策略中心准备DataFrame时出错: {e}")
             return pd.DataFrame()
@@ -102,7 +93,10 @@ class StrategyCenter:
                 continue
 
             try:
-                strategy_instance: StrategyInterface = strategy_class()
+                strategy_instance = self._instances.get(strategy_name)
+                if strategy_instance is None:
+                    strategy_instance = strategy_class()
+                    self._instances[strategy_name] = strategy_instance
                 # 将预处理好的DataFrame传递给每个策略
                 signals = strategy_instance.detect(df, mode) 
                 if signals:
@@ -8,6 +8,7 @@
 import logging
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 from .StrategyInterface import StrategyInterface
 
@@ -46,36 +47,61 @@ class VegasStrategy(StrategyInterface):
         if ema1.isna().all() or ema2.isna().all() or ema3.isna().all():
             return []
         
-        # 为了方便遍历，将所有需要的数据合并到一个DataFrame中
-        df_merged = df.copy()
-        df_merged['ema12'] = ema1
-        df_merged['ema144'] = ema2
-        df_merged['ema169'] = ema3
-        df_merged.dropna(inplace=True)
-
-        if df_merged.empty:
-            return []
-
         signals = []
-        
+
         # 2. 根据模式选择要处理的数据范围
         if mode == 'newest':
-            # 只处理最后一行数据
-            rows_to_process = [df_merged.iloc[-1]]
-        elif mode == 'full':
-            # 处理所有有效数据
-            rows_to_process = [df_merged.iloc[i] for i in range(len(df_merged))]
-        else:
+            # 只处理最后一根K线，直接取值，无需复制和合并整个DataFrame
+            data_point = {
+                'Open': df['Open'].iloc[-1],
+                'Close': df['Close'].iloc[-1],
+                'ema12': ema1.iloc[-1],
+                'ema144': ema2.iloc[-1],
+                'ema169': ema3.iloc[-1],
+            }
+            if any(pd.isna(v) for v in data_point.values()):
+                return []
+            signal_type, details = self._check_signal_condition(data_point)
+            if signal_type:
+                signals.append(self._create_signal_dict(
+                    timestamp=df.index[-1],
+                    price=data_point['Close'],
+                    signal_type=signal_type,
+                    details=details
+                ))
+                logger.info(f"策略 {self.strategy_name} 在模式 '{mode}' 下检测到 {len(signals)} 个信号。")
+            return signals
+        elif mode != 'full':
             logger.warning(f"未知的检测模式: '{mode}'。")
             return []
 
-        # 3. 遍历并执行策略逻辑
-        for row in rows_to_process:
-            signal_type, details = self._check_signal_condition(row)
+        # 使用NumPy掩码一次性筛选满足条件的K线，只对命中的K线构建信号
+        o = df['Open'].to_numpy()
+        c = df['Close'].to_numpy()
+        e12 = ema1.to_numpy()
+        e144 = ema2.to_numpy()
+        e169 = ema3.to_numpy()
+
+        # NaN参与比较时结果为 False，无需再 dropna
+        valid = ~np.isnan(np.column_stack((o, c, e12, e144, e169))).any(axis=1)
+        not_downtrend = e144 >= e169
+        buy_mask = (o <= e169) & (c >= e144)
+        sell_mask = (c < o) & (c < e12)
+        hits = np.flatnonzero(valid & not_downtrend & (buy_mask | sell_mask))
+
+        for i in hits:
+            data_point = {
+                'Open': o[i],
+                'Close': c[i],
+                'ema12': e12[i],
+                'ema144': e144[i],
+                'ema169': e169[i],
+            }
+            signal_type, details = self._check_signal_condition(data_point)
             if signal_type:
                 signal = self._create_signal_dict(
-                    timestamp=row.name, # .name是索引(即时间戳)
-                    price=row['Close'],
+                    timestamp=df.index[i],
+                    price=c[i],
                     signal_type=signal_type,
                     details=details
                 )
@@ -140,6 +166,6 @@ class VegasStrategy(StrategyInterface):
             'strategy': self.strategy_name,
             'type': signal_type,
             'price': price,
-            'timestamp': pd.to_datetime(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
             'details': details
         }
\ No newline at end of file
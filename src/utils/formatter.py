@@ -1,5 +1,10 @@
 from typing import Dict, Any, List
 from collections import defaultdict
+from functools import lru_cache
+
+# 可能影响markdown表格格式的字符，统一替换为空格
+_SPECIAL_CHARS = "|*`_{}[]()#+-.!"
+_SPECIAL_CHARS_TABLE = str.maketrans(_SPECIAL_CHARS, " " * len(_SPECIAL_CHARS))
 
 def get_strategy_shorthand(strategy_name: str) -> str:
     """将完整的策略名称转换为简写。"""
@@ -15,6 +20,7 @@ def get_strategy_shorthand(strategy_name: str) -> str:
         return 'CsMa'
     return 'Unknown'
 
+@lru_cache(maxsize=4096)
 def clean_item_name(name: str) -> str:
         """
         清理商品名称中的特殊字符
@@ -25,14 +31,8 @@ def clean_item_name(name: str) -> str:
         Returns:
             清理后的商品名称
         """
-        # 移除可能影响markdown表格格式的字符
-        special_chars = ['|', '*', '`', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!']
-        cleaned_name = name
-        for char in special_chars:
-            cleaned_name = cleaned_name.replace(char, ' ')
-        # 移除多余的空格
-        cleaned_name = ' '.join(cleaned_name.split())
-        return cleaned_name
+        # 一次translate替换所有特殊字符，再移除多余的空格
+        return ' '.join(name.translate(_SPECIAL_CHARS_TABLE).split())
 
 def format_signals_to_simplified_table(data: Dict[str, Any]) -> str:
     """将信号字典格式化为简化的字符串表格。"""
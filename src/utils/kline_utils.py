@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+K线数据处理工具模块
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# 原始K线数据每行的列顺序: [时间戳(秒), 开盘, 收盘, 最高, 最低, 成交量, 成交额]
+KLINE_COLUMNS = ['Time', 'Open', 'Close', 'High', 'Low', 'Volume', 'Amount']
+
+
+def kline_to_dataframe(raw_kline_data: List[list]) -> pd.DataFrame:
+    """
+    将原始K线数据列表转换为以时间为索引、按时间升序排列的DataFrame
+
+    Args:
+        raw_kline_data: 原始K线数据列表
+
+    Returns:
+        转换后的DataFrame，输入为空时返回空DataFrame
+
+    Raises:
+        时间戳无法转换时抛出原始异常，由调用方决定如何处理
+    """
+    if not raw_kline_data:
+        return pd.DataFrame()
+    columns = KLINE_COLUMNS[1:]
+    try:
+        # 快速路径：一次性转换为连续的float64数组，避免逐列对象转换
+        arr = np.asarray(raw_kline_data, dtype=np.float64)
+    except (ValueError, TypeError):
+        arr = None
+    # 时间列存在NaN/inf时不能直接转为整数时间戳(会变成NaT)，交给慢速路径处理
+    if arr is not None and arr.ndim == 2 and arr.shape[1] == len(KLINE_COLUMNS) and np.isfinite(arr[:, 0]).all():
+        values = arr[:, 1:]
+        values[np.isnan(values)] = 0
+        index = pd.to_datetime(arr[:, 0].astype(np.int64), unit='s')
+        df = pd.DataFrame(values, columns=columns, index=pd.Index(index, name='Time'))
+    else:
+        # 慢速路径：数据中存在无法直接转换的值时，逐列容错转换
+        df = pd.DataFrame(raw_kline_data, columns=KLINE_COLUMNS)
+        df['Time'] = pd.to_datetime(df['Time'].astype(int), unit='s')
+        df.set_index('Time', inplace=True)
+        df[columns] = df[columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    # 接口返回的数据通常已按时间排序，只有乱序时才排序
+    if not df.index.is_monotonic_increasing:
+        df.sort_index(inplace=True)
+    return df
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技术指标模块测试脚本
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.indicators import TechnicalIndicators
+
+
+def generate_mock_kline(count=300, seed=0):
+    """生成模拟K线数据"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 2, count))
+    index = pd.date_range('2024-01-01', periods=count, freq='D')
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 1, count),
+        'Close': close,
+        'High': close + 3,
+        'Low': close - 3,
+        'Volume': rng.integers(1, 100, count).astype(float),
+    }, index=index)
+
+
+class TestTechnicalIndicators(unittest.TestCase):
+    """技术指标测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.indicators = TechnicalIndicators()
+        self.df = generate_mock_kline()
+
+    def test_bollinger_bands_match_pandas_rolling(self):
+        """测试布林带与pandas rolling结果一致"""
+        middle, upper, lower = self.indicators.calculate_bollinger_bands(self.df)
+
+        period = self.indicators.boll_period
+        expected_middle = self.df['Close'].rolling(window=period).mean()
+        expected_std = self.df['Close'].rolling(window=period).std()
+
+        pd.testing.assert_series_equal(middle, expected_middle, check_names=False)
+        pd.testing.assert_series_equal(upper, expected_middle + expected_std * self.indicators.boll_std, check_names=False)
+        pd.testing.assert_series_equal(lower, expected_middle - expected_std * self.indicators.boll_std, check_names=False)
+
+    def test_bollinger_bands_short_data(self):
+        """测试数据不足一个窗口时布林带全为NaN"""
+        df = self.df.head(self.indicators.boll_period - 1)
+        middle, upper, lower = self.indicators.calculate_bollinger_bands(df)
+
+        self.assertEqual(len(middle), len(df))
+        self.assertTrue(middle.isna().all())
+        self.assertTrue(upper.isna().all())
+        self.assertTrue(lower.isna().all())
+
+    def test_cs_ma_match_pandas_rolling(self):
+        """测试CsMa均线与pandas rolling结果一致"""
+        ma_fast, ma_medium, ma_slow = self.indicators.calculate_cs_ma(self.df)
+
+        for series, window in ((ma_fast, self.indicators.cs_ma_fast),
+                               (ma_medium, self.indicators.cs_ma_medium),
+                               (ma_slow, self.indicators.cs_ma_slow)):
+            expected = self.df['Close'].rolling(window=window).mean()
+            pd.testing.assert_series_equal(series, expected, check_names=False)
+
+    def test_volume_ma_min_periods(self):
+        """测试成交量MA在窗口未填满时按已有数据求均值"""
+        volume_mas = self.indicators.calculate_volume_ma(self.df)
+
+        for series, window in zip(volume_mas, (self.indicators.volume_ma1,
+                                               self.indicators.volume_ma2,
+                                               self.indicators.volume_ma3)):
+            expected = self.df['Volume'].rolling(window=window, min_periods=1).mean()
+            pd.testing.assert_series_equal(series, expected, check_names=False)
+            self.assertFalse(series.isna().any())
+
+    def test_rsi_range_and_warmup(self):
+        """测试RSI取值范围和预热期"""
+        rsi = self.indicators.calculate_rsi(self.df)
+        period = self.indicators.rsi_period
+
+        self.assertEqual(len(rsi), len(self.df))
+        self.assertTrue(rsi.iloc[:period].isna().all())
+        self.assertFalse(rsi.iloc[period:].isna().any())
+        self.assertTrue(((rsi.dropna() >= 0) & (rsi.dropna() <= 100)).all())
+
+    def test_rsi_monotonic_prices(self):
+        """测试价格单边上涨时RSI为100"""
+        df = self.df.copy()
+        df['Close'] = np.arange(1, len(df) + 1, dtype=float)
+
+        rsi = self.indicators.calculate_rsi(df)
+
+        self.assertTrue(np.allclose(rsi.dropna(), 100))
+
+    def test_macd_structure(self):
+        """测试MACD线、信号线和柱状图的关系及预热期"""
+        macd_line, signal_line, histogram = self.indicators.calculate_macd(self.df)
+        slow = self.indicators.macd_slow
+        signal = self.indicators.macd_signal
+
+        self.assertEqual(macd_line.first_valid_index(), self.df.index[slow - 1])
+        self.assertEqual(signal_line.first_valid_index(), self.df.index[slow + signal - 2])
+        pd.testing.assert_series_equal(histogram, macd_line - signal_line, check_names=False)
+
+    def test_macd_ema_seeded_with_sma(self):
+        """测试MACD的EMA以SMA作为种子"""
+        macd_line, _, _ = self.indicators.calculate_macd(self.df)
+        fast = self.indicators.macd_fast
+        slow = self.indicators.macd_slow
+
+        close = self.df['Close']
+        fast_ema = close.iloc[:fast].mean()
+        alpha = 2 / (fast + 1)
+        for value in close.iloc[fast:slow]:
+            fast_ema = alpha * value + (1 - alpha) * fast_ema
+        expected = fast_ema - close.iloc[:slow].mean()
+
+        self.assertAlmostEqual(macd_line.iloc[slow - 1], expected)
+
+if __name__ == '__main__':
+    unittest.main()
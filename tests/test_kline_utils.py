@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+K线数据处理工具测试脚本
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.utils.kline_utils import kline_to_dataframe
+
+
+class TestKlineToDataframe(unittest.TestCase):
+    """K线DataFrame转换测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.raw = [
+            [1700000000 + i * 86400, 10.0 + i, 11.0 + i, 12.0 + i, 9.0 + i, 100 + i, 1000 + i]
+            for i in range(5)
+        ]
+
+    def test_empty_input(self):
+        """测试空数据返回空DataFrame"""
+        self.assertTrue(kline_to_dataframe([]).empty)
+
+    def test_sorted_input(self):
+        """测试已排序数据的列、索引和数值"""
+        df = kline_to_dataframe(self.raw)
+        self.assertEqual(list(df.columns), ['Open', 'Close', 'High', 'Low', 'Volume', 'Amount'])
+        self.assertEqual(df.index.name, 'Time')
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(df.index[0], pd.Timestamp(1700000000, unit='s'))
+        np.testing.assert_array_equal(df['Close'].to_numpy(), [11.0, 12.0, 13.0, 14.0, 15.0])
+
+    def test_unsorted_input_fast_path(self):
+        """测试乱序的纯数值数据会被排序"""
+        df = kline_to_dataframe(self.raw[::-1])
+        pd.testing.assert_frame_equal(df, kline_to_dataframe(self.raw))
+
+    def test_unsorted_input_slow_path(self):
+        """测试含非数值的乱序数据走慢速路径，仍会排序且非数值被置为0"""
+        raw = [list(row) for row in self.raw[::-1]]
+        raw[0][1] = 'n/a'
+        df = kline_to_dataframe(raw)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(df['Open'].iloc[-1], 0)
+        np.testing.assert_array_equal(df['Close'].to_numpy(), [11.0, 12.0, 13.0, 14.0, 15.0])
+
+    def test_missing_values_filled_with_zero(self):
+        """测试数值列中的None被置为0"""
+        raw = [list(row) for row in self.raw]
+        raw[2][5] = None
+        df = kline_to_dataframe(raw)
+        self.assertEqual(df['Volume'].iloc[2], 0)
+
+    def test_non_finite_time_raises(self):
+        """测试时间戳为NaN时不会生成NaT索引，而是抛出异常"""
+        raw = [list(row) for row in self.raw]
+        raw[1][0] = float('nan')
+        with self.assertRaises(ValueError):
+            kline_to_dataframe(raw)
+
+
+if __name__ == '__main__':
+    unittest.main()
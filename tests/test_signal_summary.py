@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+信号汇总模块测试脚本
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from config import settings
+from src.analysis import signal_summary
+from src.analysis.signal_summary import SignalSummary
+
+
+class TestSendReportAndChart(unittest.TestCase):
+    """完整报告发送测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.tmp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(settings, 'DATA_DIR', self.tmp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+        self.summary = SignalSummary()
+        boll = {'middle': 10.0, 'upper': 12.0, 'lower': 8.0}
+        self.summary.add_signal('1001', 'AK-47 | 红线', 'buy', 8.5, 8.4, 8.5, 120.0, boll,
+                                fav_name='favA', volume_ma=[100, 110, 120])
+        self.summary.add_signal('1002', 'M4A1-S | 氮化处理', 'sell', 12.5, 12.1, 12.5, 80.0, boll,
+                                fav_name='favA', volume_ma=[90, 95, 100])
+        self.summary.add_signal('1003', 'AWP | 二西莫夫', 'buy', 7.9, 8.0, 7.9, 60.0, boll,
+                                fav_name='favB', volume_ma=[50, 55, 60])
+
+        self.chart_paths = {}
+        for item_id, color in (('1001', 'red'), ('1003', 'blue')):
+            path = os.path.join(self.tmp_dir, f'{item_id}.png')
+            Image.new('RGB', (40, 20), color).save(path)
+            self.chart_paths[item_id] = path
+
+    def test_send_with_charts(self):
+        """测试带图表发送：合并图片以PUT发送，消息头包含所有收藏夹的买卖信号"""
+        with mock.patch.object(signal_summary, 'send_ntfy') as send:
+            self.assertTrue(self.summary.send_report_and_chart('test', self.chart_paths))
+
+        send.assert_called_once()
+        args, kwargs = send.call_args
+        self.assertEqual(args[0], 'test')
+        self.assertIsInstance(args[1], io.BytesIO)
+        self.assertEqual(kwargs['method'], 'PUT')
+        merged = Image.open(args[1])
+        self.assertEqual(merged.size, (40, 40))
+
+        message = kwargs['headers']['Message']
+        self.assertTrue(message.startswith('=?UTF-8?B?'))
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp_dir, 'signals'))), 1)
+
+    def test_send_text_only(self):
+        """测试无图表时发送文本消息，按收藏夹中的信号列表逐条生成"""
+        with mock.patch.object(signal_summary, 'send_ntfy') as send:
+            self.assertTrue(self.summary.send_report_and_chart('test'))
+
+        message = send.call_args[0][1]
+        self.assertIsInstance(message, str)
+        for item_id in ('1001', '1002', '1003'):
+            self.assertIn(f'ID: {item_id}', message)
+        self.assertIn('📌 AK 47 红线', message)
+        buy_part, sell_part = message.split('📉 Sell Signals:')
+        self.assertIn('ID: 1003', buy_part)
+        self.assertIn('ID: 1002', sell_part)
+        self.assertNotIn('ID: 1001', sell_part)
+
+    def test_no_signals(self):
+        """测试没有信号时不发送"""
+        self.summary.clear_signals()
+        with mock.patch.object(signal_summary, 'send_ntfy') as send:
+            self.assertFalse(self.summary.send_report_and_chart('test', self.chart_paths))
+        send.assert_not_called()
+
+
+class TestAddSignal(unittest.TestCase):
+    """添加信号测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.tmp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(settings, 'DATA_DIR', self.tmp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.summary = SignalSummary()
+        self.boll = {'middle': 10.0, 'upper': 12.0, 'lower': 8.0}
+
+    def test_previous_touch_without_price(self):
+        """测试上次触碰价格缺失时各输出都显示为 '-'"""
+        self.summary.add_signal('1001', 'AK-47 | 红线', 'buy', 8.5, 8.4, 8.5, 120.0, self.boll,
+                                previous_touch={'price': None, 'timestamp': '-', 'days_ago': 3},
+                                fav_name='f', volume_ma=[100, 110, 120])
+        signal = self.summary.signals['f'][0]
+        self.assertIn('Previous Touch: - (3 days ago)', signal['report_row'])
+        self.assertIn('| - |', signal['md_row'])
+        self.assertEqual(self.summary._by_type['f']['buy'], [signal])
+
+    def test_format_error_skips_signal(self):
+        """测试字段非法时记录日志并跳过信号，不会只加入一半"""
+        bad_inputs = [
+            {'volume': float('nan'), 'boll_values': self.boll, 'volume_ma': [1, 2, 3]},
+            {'volume': 120.0, 'boll_values': {'middle': 10.0}, 'volume_ma': [1, 2, 3]},
+            {'volume': 120.0, 'boll_values': self.boll, 'volume_ma': None},
+        ]
+        for kwargs in bad_inputs:
+            with self.subTest(kwargs=kwargs):
+                with self.assertLogs(signal_summary.logger, level='ERROR'):
+                    self.summary.add_signal('1001', 'AK-47 | 红线', 'buy', 8.5, 8.4, 8.5,
+                                            fav_name='f', **kwargs)
+                self.assertEqual(self.summary.signals, {})
+                self.assertEqual(self.summary._by_type, {})
+
+        # 之后添加的正常信号不受影响
+        self.summary.add_signal('1002', 'AWP | 二西莫夫', 'sell', 7.9, 8.0, 7.9, 60.0, self.boll,
+                                fav_name='f', volume_ma=[50, 55, 60])
+        self.assertEqual(len(self.summary.signals['f']), 1)
+        self.assertEqual(len(self.summary._by_type['f']['sell']), 1)
+
+if __name__ == '__main__':
+    unittest.main()